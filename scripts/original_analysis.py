@@ -5,14 +5,17 @@ Analyzing the relationship between funding, displacement, and media coverage
 """
 
 # Import necessary libraries
+import asyncio
+import math
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from prophet import Prophet
-from sklearn.preprocessing import MinMaxScaler
 from gdeltdoc import GdeltDoc, Filters
-from scipy.stats import pearsonr
+from numba import njit
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -25,11 +28,53 @@ print("Examining funding flows, displacement, and media coverage")
 print("="*70)
 print()
 
+# Shared HTTP session: pooled keep-alive connections, retries on 429/5xx.
+# Once retries run out the last response is returned (not raised), so the
+# status-code check below still skips the failed year.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    ),
+))
+
 # Helper Functions
 def normalize(series):
     """Normalize values to 0-1 range for comparison"""
-    scaler = MinMaxScaler()
-    return scaler.fit_transform(series.values.reshape(-1, 1))
+    x = series.to_numpy(dtype=np.float64, copy=False)
+    mn, mx = np.nanmin(x), np.nanmax(x)
+    return (x - mn) / (mx - mn if mx != mn else 1.0)
+
+@njit(fastmath={"reassoc", "contract"}, cache=True)
+def pearson_r_p(x, y):
+    """Pearson r and two-sided p-value (Fisher z-transform) in a single pass"""
+    n = x.shape[0]
+    sx = sy = sxx = syy = sxy = 0.0
+    for i in range(n):
+        sx += x[i]
+        sy += y[i]
+        sxx += x[i] * x[i]
+        syy += y[i] * y[i]
+        sxy += x[i] * y[i]
+
+    denom = math.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    if denom == 0.0:
+        # Constant input: correlation is undefined
+        return np.nan, np.nan
+
+    r = max(-1.0, min(1.0, (n * sxy - sx * sy) / denom))
+    if abs(r) == 1.0:
+        return r, 0.0
+    if n <= 3:
+        return r, np.nan
+
+    z = math.atanh(r) * math.sqrt(n - 3)
+    return r, math.erfc(abs(z) / math.sqrt(2.0))
 
 # ============================================================================
 # PART 1: HUMANITARIAN FUNDING DATA (FTS)
@@ -44,7 +89,7 @@ def fetch_funding_data(years):
     for year in years:
         url = f"https://api.hpc.tools/v1/public/fts/flow?year={year}"
         print(f"Fetching funding data for {year}...")
-        response = requests.get(url)
+        response = SESSION.get(url)
         if response.status_code == 200:
             data = response.json()
             all_flows.extend(data.get("data", {}).get("flows", []))
@@ -53,7 +98,7 @@ def fetch_funding_data(years):
     return pd.DataFrame(all_flows)
 
 def process_funding_data(funding_df):
-    """Process and model funding data with Prophet"""
+    """Process and model funding data (linear trend + quarterly seasonality)"""
     funding_df["createdAt"] = pd.to_datetime(funding_df["createdAt"], errors="coerce")
     funding_df = funding_df.dropna(subset=["createdAt"])
 
@@ -67,14 +112,16 @@ def process_funding_data(funding_df):
     funding_by_date["ds"] = pd.to_datetime(funding_by_date["ds"])
     funding_by_date["y"] = np.log1p(funding_by_date["y"])  # Log transform to stabilize variance
 
-    # Prophet model with quarterly seasonality
-    print("Training Prophet model...")
-    model = Prophet(yearly_seasonality=False, weekly_seasonality=False)
-    model.add_seasonality(name="quarterly", period=91.25, fourier_order=5)
-    model.fit(funding_by_date)
+    # Least-squares fit of a linear trend with quarterly Fourier seasonality
+    # (period 91.25 days, order 5): the model Prophet was configured for
+    print("Fitting trend and quarterly seasonality...")
+    t = (funding_by_date["ds"] - funding_by_date["ds"].min()).dt.days.to_numpy(dtype=float)
+    angles = 2 * np.pi * np.outer(t, np.arange(1, 6)) / 91.25
+    X = np.column_stack([np.ones_like(t), t, np.sin(angles), np.cos(angles)])
+    beta, *_ = np.linalg.lstsq(X, funding_by_date["y"].to_numpy(dtype=float), rcond=None)
 
-    forecast = model.predict(model.make_future_dataframe(periods=0))
-    forecast = forecast[["ds", "yhat"]]
+    forecast = funding_by_date[["ds"]].copy()
+    forecast["yhat"] = X @ beta
 
     # Filter to analysis period
     forecast = forecast[
@@ -105,21 +152,44 @@ country_list = [
     "UGA",
 ]
 
+async def _fetch_country(session, country, sem):
+    """Fetch the IDP records of one country ([] on failure)"""
+    url = "https://dtmapi.iom.int/api/idpAdmin0Data/GetAdmin0Datav2"
+    params = {"Admin0Pcode": country}
+    async with sem:
+        try:
+            async with session.get(
+                url,
+                params=params,
+                headers={"User-Agent": "Mozilla/5.0"},
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+                if response.status != 200:
+                    print(f"Error fetching data for {country}: {response.status}")
+                    return []
+                data = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"Error fetching data for {country}: {e}")
+            return []
+    return data.get("result", [])
+
+async def fetch_displacement_data_async(country_list, max_concurrency=10):
+    """Fetch all countries concurrently, at most `max_concurrency` at a time"""
+    sem = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *[_fetch_country(session, country, sem) for country in country_list]
+        )
+    all_displacement_data = []
+    for result in results:
+        all_displacement_data.extend(result)
+    return pd.DataFrame(all_displacement_data)
+
 def fetch_displacement_data(country_list):
     """Fetch IDP data from DTM API"""
-    all_displacement_data = []
     print(f"Fetching displacement data for {len(country_list)} countries...")
-    for country in country_list:
-        url = "https://dtmapi.iom.int/api/idpAdmin0Data/GetAdmin0Datav2"
-        params = {"Admin0Pcode": country}
-        response = requests.get(
-            url, params=params, headers={"User-Agent": "Mozilla/5.0"}
-        )
-        if response.status_code == 200:
-            all_displacement_data.extend(response.json().get("result", []))
-        else:
-            print(f"Error fetching data for {country}: {response.status_code}")
-    return pd.DataFrame(all_displacement_data)
+    return asyncio.run(fetch_displacement_data_async(country_list))
 
 def process_displacement_data(displacement_df):
     """Aggregate displacement data quarterly"""
@@ -234,82 +304,56 @@ quarterly_tone = process_tone_data(tone_timeline)
 print(f"\n✓ Tone data processed: {len(quarterly_tone)} quarters")
 
 # ============================================================================
-# VISUALIZATION 1: Funding vs Displacement
+# VISUALIZATIONS: one 2x2 dashboard
 # ============================================================================
 print("\n" + "="*70)
 print("GENERATING VISUALIZATIONS")
 print("="*70)
 
-plt.figure(figsize=(14, 7))
-plt.plot(quarterly_funding["ds"], quarterly_funding["yhat_norm"],
-         label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
-plt.scatter(aggregated_displacement["reportingDate"], 
-           aggregated_displacement["numPresentIdpInd_norm"],
-           label="Displacement (Normalized)", s=100, color='#D62828', alpha=0.7, zorder=5)
-plt.title("Humanitarian Funding vs. Global Displacement", fontsize=16, fontweight='bold')
-plt.xlabel("Date", fontsize=12)
-plt.ylabel("Normalized Values (0-1)", fontsize=12)
-plt.legend(fontsize=11)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('/mnt/user-data/outputs/funding_vs_displacement.png', dpi=300, bbox_inches='tight')
-print("\n✓ Saved: funding_vs_displacement.png")
-plt.close()
-
-# ============================================================================
-# VISUALIZATION 2: Funding vs Media Volume
-# ============================================================================
-plt.figure(figsize=(14, 7))
-plt.plot(quarterly_funding["ds"], quarterly_funding["yhat_norm"],
-         label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
-plt.plot(quarterly_gdelt["ds"], quarterly_gdelt["volume_intensity_norm"],
-         label="GDELT Media Volume (Normalized)", linewidth=2.5, color='#F77F00')
-plt.title("Funding vs Media Coverage Volume", fontsize=16, fontweight='bold')
-plt.xlabel("Date", fontsize=12)
-plt.ylabel("Normalized Values (0-1)", fontsize=12)
-plt.legend(fontsize=11)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('/mnt/user-data/outputs/funding_vs_media_volume.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: funding_vs_media_volume.png")
-plt.close()
-
-# ============================================================================
-# VISUALIZATION 3: Displacement vs Media Volume
-# ============================================================================
-plt.figure(figsize=(14, 7))
-plt.scatter(aggregated_displacement["reportingDate"],
-           aggregated_displacement["numPresentIdpInd_norm"],
-           label="Displacement (Normalized)", s=100, color='#D62828', alpha=0.7, zorder=5)
-plt.plot(quarterly_gdelt["ds"], quarterly_gdelt["volume_intensity_norm"],
-         label="GDELT Media Volume (Normalized)", linewidth=2.5, color='#F77F00')
-plt.title("Displacement vs Media Coverage", fontsize=16, fontweight='bold')
-plt.xlabel("Date", fontsize=12)
-plt.ylabel("Normalized Values (0-1)", fontsize=12)
-plt.legend(fontsize=11)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('/mnt/user-data/outputs/displacement_vs_media.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: displacement_vs_media.png")
-plt.close()
-
-# ============================================================================
-# VISUALIZATION 4: Funding vs Media Tone
-# ============================================================================
-plt.figure(figsize=(14, 7))
-plt.plot(quarterly_funding["ds"], quarterly_funding["yhat_norm"],
-         label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
-plt.plot(quarterly_tone["ds"], quarterly_tone["tone_norm"],
-         label="GDELT Media Tone (Normalized)", linewidth=2.5, color='#06A77D')
-plt.title("Funding vs Media Sentiment", fontsize=16, fontweight='bold')
-plt.xlabel("Date", fontsize=12)
-plt.ylabel("Normalized Values (0-1)", fontsize=12)
-plt.legend(fontsize=11)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('/mnt/user-data/outputs/funding_vs_media_tone.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: funding_vs_media_tone.png")
-plt.close()
+fig, axes = plt.subplots(2, 2, figsize=(20, 14), sharex=True)
+ax = axes.flat
+
+# Panel 1: Funding vs Displacement
+ax[0].plot(quarterly_funding["ds"], quarterly_funding["yhat_norm"],
+           label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
+ax[0].scatter(aggregated_displacement["reportingDate"],
+              aggregated_displacement["numPresentIdpInd_norm"],
+              label="Displacement (Normalized)", s=100, color='#D62828', alpha=0.7, zorder=5)
+ax[0].set_title("Humanitarian Funding vs. Global Displacement", fontsize=16, fontweight='bold')
+
+# Panel 2: Funding vs Media Volume
+ax[1].plot(quarterly_funding["ds"], quarterly_funding["yhat_norm"],
+           label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
+ax[1].plot(quarterly_gdelt["ds"], quarterly_gdelt["volume_intensity_norm"],
+           label="GDELT Media Volume (Normalized)", linewidth=2.5, color='#F77F00')
+ax[1].set_title("Funding vs Media Coverage Volume", fontsize=16, fontweight='bold')
+
+# Panel 3: Displacement vs Media Volume
+ax[2].scatter(aggregated_displacement["reportingDate"],
+              aggregated_displacement["numPresentIdpInd_norm"],
+              label="Displacement (Normalized)", s=100, color='#D62828', alpha=0.7, zorder=5)
+ax[2].plot(quarterly_gdelt["ds"], quarterly_gdelt["volume_intensity_norm"],
+           label="GDELT Media Volume (Normalized)", linewidth=2.5, color='#F77F00')
+ax[2].set_title("Displacement vs Media Coverage", fontsize=16, fontweight='bold')
+
+# Panel 4: Funding vs Media Tone
+ax[3].plot(quarterly_funding["ds"], quarterly_funding["yhat_norm"],
+           label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
+ax[3].plot(quarterly_tone["ds"], quarterly_tone["tone_norm"],
+           label="GDELT Media Tone (Normalized)", linewidth=2.5, color='#06A77D')
+ax[3].set_title("Funding vs Media Sentiment", fontsize=16, fontweight='bold')
+
+for a in ax:
+    a.set_ylabel("Normalized Values (0-1)", fontsize=12)
+    a.legend(fontsize=11)
+    a.grid(True, alpha=0.3)
+for a in axes[1]:
+    a.set_xlabel("Date", fontsize=12)
+
+fig.tight_layout()
+fig.savefig('/mnt/user-data/outputs/dashboard.png', dpi=200, bbox_inches='tight')
+print("\n✓ Saved: dashboard.png")
+plt.close(fig)
 
 # ============================================================================
 # CORRELATION ANALYSIS
@@ -323,26 +367,30 @@ funding_quarterly = quarterly_funding.set_index('ds').resample('QE').mean().rese
 funding_quarterly = funding_quarterly[(funding_quarterly['ds'] >= '2022-02-01') & 
                                       (funding_quarterly['ds'] <= '2024-02-29')]
 
-# Ensure all datasets have matching quarters
-common_dates = set(funding_quarterly['ds']) & set(aggregated_displacement['reportingDate']) & \
-               set(quarterly_gdelt['ds']) & set(quarterly_tone['ds'])
-common_dates = sorted(list(common_dates))
+# Index every dataset by date and keep the quarters they all share
+funding_by_q = funding_quarterly.set_index('ds')
+disp_by_q = aggregated_displacement.set_index('reportingDate')
+vol_by_q = quarterly_gdelt.set_index('ds')
+tone_by_q = quarterly_tone.set_index('ds')
+
+common_dates = (
+    funding_by_q.index
+    .intersection(disp_by_q.index)
+    .intersection(vol_by_q.index)
+    .intersection(tone_by_q.index)
+)
 
 # Filter to common dates
-fund_aligned = funding_quarterly[funding_quarterly['ds'].isin(common_dates)].sort_values('ds')
-disp_aligned = aggregated_displacement[aggregated_displacement['reportingDate'].isin(common_dates)].sort_values('reportingDate')
-vol_aligned = quarterly_gdelt[quarterly_gdelt['ds'].isin(common_dates)].sort_values('ds')
-tone_aligned = quarterly_tone[quarterly_tone['ds'].isin(common_dates)].sort_values('ds')
+fund_aligned = funding_by_q.loc[common_dates, 'yhat_norm'].to_numpy(dtype=np.float64)
+disp_aligned = disp_by_q.loc[common_dates, 'numPresentIdpInd_norm'].to_numpy(dtype=np.float64)
+vol_aligned = vol_by_q.loc[common_dates, 'volume_intensity_norm'].to_numpy(dtype=np.float64)
+tone_aligned = tone_by_q.loc[common_dates, 'tone_norm'].to_numpy(dtype=np.float64)
 
 # Calculate correlations
-corr_fund_disp, p_fund_disp = pearsonr(fund_aligned['yhat_norm'].values, 
-                                         disp_aligned['numPresentIdpInd_norm'].values)
-corr_fund_vol, p_fund_vol = pearsonr(fund_aligned['yhat_norm'].values, 
-                                      vol_aligned['volume_intensity_norm'].values)
-corr_fund_tone, p_fund_tone = pearsonr(fund_aligned['yhat_norm'].values, 
-                                        tone_aligned['tone_norm'].values)
-corr_disp_vol, p_disp_vol = pearsonr(disp_aligned['numPresentIdpInd_norm'].values, 
-                                      vol_aligned['volume_intensity_norm'].values)
+corr_fund_disp, p_fund_disp = pearson_r_p(fund_aligned, disp_aligned)
+corr_fund_vol, p_fund_vol = pearson_r_p(fund_aligned, vol_aligned)
+corr_fund_tone, p_fund_tone = pearson_r_p(fund_aligned, tone_aligned)
+corr_disp_vol, p_disp_vol = pearson_r_p(disp_aligned, vol_aligned)
 
 print("\nPearson Correlation Coefficients:")
 print("-" * 70)
@@ -365,5 +413,5 @@ print("• Funding shows more correlation with media patterns than with displace
 print("• This suggests humanitarian funding is more responsive to visibility than need")
 print("• High-profile crises attract disproportionate funding while others remain underfunded")
 print("\n" + "="*70)
-print("\n✓ Analysis complete! All visualizations saved to /mnt/user-data/outputs/")
+print("\n✓ Analysis complete! Dashboard saved to /mnt/user-data/outputs/dashboard.png")
 print("="*70)
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+API Response Cache
+Stores API responses under data/cache/, keyed on a SHA-256 of the request
+"""
+
+import hashlib
+import json
+import os
+import pandas as pd
+from pathlib import Path
+from time import time
+
+from ._storage import write_parquet
+
+CACHE_DIR = Path("data/cache")
+DEFAULT_TTL = 86400  # one day
+
+
+def cache_key(url: str, params: dict = None) -> str:
+    """Hash a request (URL + query parameters) into a cache key"""
+    payload = json.dumps([url, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _fresh_path(key: str, suffix: str, ttl: float):
+    """Return the cache file for `key` if it exists and is younger than `ttl`"""
+    path = CACHE_DIR / f"{key}{suffix}"
+    if ttl > 0 and path.exists() and time() - path.stat().st_mtime < ttl:
+        return path
+    return None
+
+
+def _tmp_path(path: Path) -> Path:
+    """Per-process scratch file next to `path`, swapped in with os.replace"""
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+def load_json(key: str, ttl: float = DEFAULT_TTL):
+    """Load a cached JSON payload, or None if missing, stale or unreadable"""
+    path = _fresh_path(key, ".json", ttl)
+    if path is None:
+        return None
+
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def store_json(key: str, payload):
+    """Write a JSON payload to the cache"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    tmp = _tmp_path(path)
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def load_frame(key: str, ttl: float = DEFAULT_TTL):
+    """Load a cached DataFrame, or None if missing, stale or unreadable"""
+    path = _fresh_path(key, ".parquet", ttl)
+    if path is None:
+        return None
+
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+
+
+def store_frame(key: str, df: pd.DataFrame):
+    """Write a DataFrame to the cache"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.parquet"
+    tmp = _tmp_path(path)
+    write_parquet(df, tmp)
+    os.replace(tmp, path)
@@ -0,0 +1,33 @@
+"""
+Raw Data Storage
+Writes fetched API data to disk as Parquet
+"""
+
+import json
+import pandas as pd
+from pathlib import Path
+
+
+def _is_nested(value) -> bool:
+    return isinstance(value, (list, dict))
+
+
+def write_parquet(df: pd.DataFrame, path: Path):
+    """
+    Write a DataFrame to zstd-compressed Parquet
+
+    Object columns holding lists/dicts (e.g. FTS source/destination
+    objects) are stored as JSON strings so heterogeneous records don't
+    trip Arrow's schema inference.
+    """
+    nested = [
+        col for col in df.columns
+        if df[col].dtype == object and df[col].map(_is_nested).any()
+    ]
+    if nested:
+        df = df.assign(**{
+            col: df[col].map(lambda v: json.dumps(v) if _is_nested(v) else v)
+            for col in nested
+        })
+
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
@@ -3,78 +3,242 @@ DTM Data Acquisition Module
 Fetches displacement data from the DTM API
 """
 
-import requests
+import asyncio
+import aiohttp
 import pandas as pd
 import logging
 from pathlib import Path
-from time import sleep
+from time import monotonic
+
+from ._cache import DEFAULT_TTL, cache_key, load_json, store_json
+from ._storage import write_parquet
 
 logger = logging.getLogger(__name__)
 
+DTM_URL = "https://dtmapi.iom.int/api/idpAdmin0Data/GetAdmin0Datav2"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Failures that skip a single country instead of aborting the whole fetch
+# (ValueError covers a non-JSON body; ContentTypeError is a ClientError)
+_FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+
+
+class _TokenBucket:
+    """Async token bucket limiting how many requests start per second"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
 
-def fetch_displacement_data(country_list: list, save_raw: bool = True) -> pd.DataFrame:
+
+async def _fetch_one(
+    session: aiohttp.ClientSession,
+    country: str,
+    sem: asyncio.Semaphore,
+    bucket: _TokenBucket,
+    cache_ttl: float
+) -> list:
+    """Fetch the IDP records of a single country"""
+    params = {"Admin0Pcode": country}
+    key = cache_key(DTM_URL, params)
+
+    data = await asyncio.to_thread(load_json, key, cache_ttl)
+    if data is None:
+        async with sem:
+            await bucket.acquire()
+            async with session.get(
+                DTM_URL,
+                params=params,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+        await asyncio.to_thread(store_json, key, data)
+
+    return data.get("result", [])
+
+
+async def _fetch_batch(
+    session: aiohttp.ClientSession,
+    country_list: list,
+    cache_ttl: float
+) -> dict:
     """
-    Fetch IDP data from DTM API for multiple countries
-    
+    Try to fetch all countries in one request (comma-separated Admin0Pcode)
+
+    Returns the records grouped by requested country. Countries missing
+    from the response (or everything, if the API rejects the batch) are
+    left out so the caller fetches them one by one. A rejected batch is
+    cached as an empty result.
+    """
+    params = {"Admin0Pcode": ",".join(country_list)}
+    key = cache_key(DTM_URL, params)
+
+    data = await asyncio.to_thread(load_json, key, cache_ttl)
+    if data is None:
+        try:
+            async with session.get(
+                DTM_URL,
+                params=params,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=60)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+        except _FETCH_ERRORS:
+            # Remember the rejection for cache_ttl so later runs go straight
+            # to the per-country requests instead of re-probing
+            await asyncio.to_thread(store_json, key, {"result": []})
+            return {}
+        await asyncio.to_thread(store_json, key, data)
+
+    requested = set(country_list)
+    by_country = {}
+    for record in data.get("result") or []:
+        country = record.get("admin0Pcode")
+        if country in requested:
+            by_country.setdefault(country, []).append(record)
+
+    return by_country
+
+
+async def fetch_displacement_data_async(
+    country_list: list,
+    save_raw: bool = True,
+    max_concurrency: int = 10,
+    rate_limit: float = 5.0,
+    cache_ttl: float = DEFAULT_TTL
+) -> pd.DataFrame:
+    """
+    Fetch IDP data from DTM API for multiple countries concurrently
+
     Parameters:
     -----------
     country_list : list
         List of ISO3 country codes
     save_raw : bool
         Whether to save raw responses to disk
-        
+    max_concurrency : int
+        Maximum number of requests in flight at once
+    rate_limit : float
+        Maximum number of requests started per second
+    cache_ttl : float
+        Seconds a cached response stays valid (0 bypasses the cache)
+
     Returns:
     --------
     pd.DataFrame
         DataFrame containing displacement data
     """
     all_displacement_data = []
-    
+
     logger.info(f"Fetching displacement data for {len(country_list)} countries...")
-    
+
+    sem = asyncio.Semaphore(max_concurrency)
+    bucket = _TokenBucket(rate_limit, max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        by_country = {}
+        if len(country_list) > 1:
+            by_country = await _fetch_batch(session, country_list, cache_ttl)
+
+        remaining = [country for country in country_list if country not in by_country]
+        if by_country and remaining:
+            logger.info(f"  Batch request covered {len(by_country)} countries, "
+                        f"fetching {len(remaining)} individually")
+
+        results = await asyncio.gather(
+            *[_fetch_one(session, country, sem, bucket, cache_ttl)
+              for country in remaining],
+            return_exceptions=True
+        )
+        by_country.update(zip(remaining, results))
+
     for i, country in enumerate(country_list, 1):
-        url = "https://dtmapi.iom.int/api/idpAdmin0Data/GetAdmin0Datav2"
-        params = {"Admin0Pcode": country}
-        headers = {"User-Agent": "Mozilla/5.0"}
-        
-        try:
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json().get("result", [])
-            all_displacement_data.extend(result)
-            
-            if result:
-                logger.info(f"  [{i}/{len(country_list)}] {country}: {len(result)} records")
-            else:
-                logger.warning(f"  [{i}/{len(country_list)}] {country}: No data")
-            
-            # Rate limiting
-            sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"  [{i}/{len(country_list)}] {country}: Error - {e}")
+        result = by_country[country]
+        if isinstance(result, _FETCH_ERRORS):
+            logger.error(f"  [{i}/{len(country_list)}] {country}: Error - {result}")
             continue
-    
+        if isinstance(result, BaseException):
+            raise result
+
+        all_displacement_data.extend(result)
+
+        if result:
+            logger.info(f"  [{i}/{len(country_list)}] {country}: {len(result)} records")
+        else:
+            logger.warning(f"  [{i}/{len(country_list)}] {country}: No data")
+
     displacement_df = pd.DataFrame(all_displacement_data)
     logger.info(f"\n✓ Total displacement records fetched: {len(displacement_df)}")
-    
+
     # Save raw data
     if save_raw and not displacement_df.empty:
         raw_dir = Path("data/raw/dtm")
         raw_dir.mkdir(parents=True, exist_ok=True)
-        displacement_df.to_csv(raw_dir / "dtm_raw.csv", index=False)
-    
+        write_parquet(displacement_df, raw_dir / "dtm_raw.parquet")
+
     return displacement_df
 
 
+def fetch_displacement_data(
+    country_list: list,
+    save_raw: bool = True,
+    cache_ttl: float = DEFAULT_TTL
+) -> pd.DataFrame:
+    """
+    Fetch IDP data from DTM API for multiple countries
+
+    Synchronous wrapper around `fetch_displacement_data_async`. Inside a
+    running event loop (e.g. Jupyter), await the async version instead.
+
+    Parameters:
+    -----------
+    country_list : list
+        List of ISO3 country codes
+    save_raw : bool
+        Whether to save raw responses to disk
+    cache_ttl : float
+        Seconds a cached response stays valid (0 bypasses the cache)
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame containing displacement data
+    """
+    return asyncio.run(
+        fetch_displacement_data_async(country_list, save_raw, cache_ttl=cache_ttl)
+    )
+
+
 if __name__ == "__main__":
     # Test the fetcher
     logging.basicConfig(level=logging.INFO)
-    
+
     test_countries = ["UKR", "SYR", "AFG", "SOM", "YEM"]
     df = fetch_displacement_data(test_countries)
-    
+
     print(f"\nShape: {df.shape}")
     print(f"Columns: {df.columns.tolist()}")
     print(f"\nSample:\n{df.head()}")
@@ -3,65 +3,147 @@ FTS Data Acquisition Module
 Fetches humanitarian funding data from the FTS API
 """
 
-import requests
+import asyncio
+import aiohttp
+import ijson
 import pandas as pd
 import logging
 from pathlib import Path
 
+from ._cache import DEFAULT_TTL, cache_key, load_json, store_json
+from ._storage import write_parquet
+
 logger = logging.getLogger(__name__)
 
+FTS_URL = "https://api.hpc.tools/v1/public/fts/flow"
+
+# Failures that skip a single year instead of aborting the whole fetch
+# (ijson.JSONError covers an invalid or truncated stream)
+_FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ijson.JSONError)
+
+
+def _frame_year(flows: list, year: int, save_raw: bool) -> pd.DataFrame:
+    """Build the DataFrame of a single year's flows, saving it if requested"""
+    year_df = pd.DataFrame(flows)
+
+    if save_raw:
+        raw_dir = Path("data/raw/fts")
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        write_parquet(year_df, raw_dir / f"fts_{year}.parquet")
+
+    return year_df
 
-def fetch_funding_data(years: list, save_raw: bool = True) -> pd.DataFrame:
+
+async def _fetch_year(
+    session: aiohttp.ClientSession,
+    year: int,
+    save_raw: bool,
+    cache_ttl: float
+) -> tuple:
+    """Fetch the funding flows of a single year"""
+    logger.info(f"Fetching funding data for {year}...")
+
+    params = {"year": year}
+    key = cache_key(FTS_URL, params)
+
+    flows = await asyncio.to_thread(load_json, key, cache_ttl)
+    if flows is None:
+        # Per-read timeouts: a full year is a large download
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+        async with session.get(FTS_URL, params=params, timeout=timeout) as response:
+            response.raise_for_status()
+
+            # Stream the flows out of the payload instead of parsing it whole
+            flows = [
+                flow async for flow in ijson.items_async(
+                    response.content, "data.flows.item", use_float=True
+                )
+            ]
+        await asyncio.to_thread(store_json, key, flows)
+
+    logger.info(f"  ✓ Retrieved {len(flows)} flows for {year}")
+
+    # Build (and save) the frame off the event loop so it overlaps the
+    # other downloads
+    year_df = await asyncio.to_thread(_frame_year, flows, year, save_raw)
+
+    return year, year_df
+
+
+async def fetch_funding_data_async(
+    years: list,
+    save_raw: bool = True,
+    cache_ttl: float = DEFAULT_TTL
+) -> pd.DataFrame:
     """
-    Fetch funding flows from FTS API
-    
+    Fetch funding flows from FTS API, all years concurrently
+
     Parameters:
     -----------
     years : list
         List of years to fetch data for
     save_raw : bool
         Whether to save raw responses to disk
-        
+    cache_ttl : float
+        Seconds a cached response stays valid (0 bypasses the cache)
+
     Returns:
     --------
     pd.DataFrame
         DataFrame containing funding flow data
     """
-    all_flows = []
-    
-    for year in years:
-        url = f"https://api.hpc.tools/v1/public/fts/flow?year={year}"
-        logger.info(f"Fetching funding data for {year}...")
-        
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            flows = data.get("data", {}).get("flows", [])
-            all_flows.extend(flows)
-            
-            logger.info(f"  ✓ Retrieved {len(flows)} flows for {year}")
-            
-            # Save raw data
-            if save_raw:
-                raw_dir = Path("data/raw/fts")
-                raw_dir.mkdir(parents=True, exist_ok=True)
-                pd.DataFrame(flows).to_csv(
-                    raw_dir / f"fts_{year}.csv", 
-                    index=False
-                )
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to retrieve data for {year}: {e}")
+    year_dfs = []
+
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(
+            *[_fetch_year(session, year, save_raw, cache_ttl) for year in years],
+            return_exceptions=True
+        )
+
+    for year, result in zip(years, results):
+        if isinstance(result, _FETCH_ERRORS):
+            logger.error(f"Failed to retrieve data for {year}: {result}")
             continue
-    
-    funding_df = pd.DataFrame(all_flows)
+        if isinstance(result, BaseException):
+            raise result
+
+        _, year_df = result
+        year_dfs.append(year_df)
+
+    funding_df = pd.concat(year_dfs, ignore_index=True) if year_dfs else pd.DataFrame()
     logger.info(f"\n✓ Total funding records fetched: {len(funding_df)}")
-    
+
     return funding_df
 
 
+def fetch_funding_data(
+    years: list,
+    save_raw: bool = True,
+    cache_ttl: float = DEFAULT_TTL
+) -> pd.DataFrame:
+    """
+    Fetch funding flows from FTS API
+
+    Synchronous wrapper around `fetch_funding_data_async`. Inside a
+    running event loop (e.g. Jupyter), await the async version instead.
+
+    Parameters:
+    -----------
+    years : list
+        List of years to fetch data for
+    save_raw : bool
+        Whether to save raw responses to disk
+    cache_ttl : float
+        Seconds a cached response stays valid (0 bypasses the cache)
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame containing funding flow data
+    """
+    return asyncio.run(fetch_funding_data_async(years, save_raw, cache_ttl))
+
+
 if __name__ == "__main__":
     # Test the fetcher
     logging.basicConfig(level=logging.INFO)
@@ -8,14 +8,47 @@ import logging
 from pathlib import Path
 from gdeltdoc import GdeltDoc, Filters
 
+from ._cache import DEFAULT_TTL, cache_key, load_frame, store_frame
+from ._storage import write_parquet
+
 logger = logging.getLogger(__name__)
 
+# Shared client: volume and tone queries may run concurrently in threads
+_GDELT = GdeltDoc()
+
+
+def _timeline_search(
+    mode: str,
+    keyword: str,
+    start_date: str,
+    end_date: str,
+    cache_ttl: float
+) -> pd.DataFrame:
+    """Run a GDELT timeline query, served from the on-disk cache when fresh"""
+    key = cache_key(
+        f"gdelt:{mode}",
+        {"keyword": keyword, "start_date": start_date, "end_date": end_date}
+    )
+
+    results = load_frame(key, cache_ttl)
+    if results is None:
+        f = Filters(
+            keyword=keyword,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        results = _GDELT.timeline_search(mode, f)
+        store_frame(key, results)
+
+    return results
+
 
 def fetch_gdelt_data(
     keyword: str,
     start_date: str,
     end_date: str,
-    save_raw: bool = True
+    save_raw: bool = True,
+    cache_ttl: float = DEFAULT_TTL
 ) -> pd.DataFrame:
     """
     Fetch media coverage volume data from GDELT
@@ -30,6 +63,8 @@ def fetch_gdelt_data(
         End date in YYYY-MM-DD format
     save_raw : bool
         Whether to save raw data to disk
+    cache_ttl : float
+        Seconds a cached response stays valid (0 bypasses the cache)
         
     Returns:
     --------
@@ -40,24 +75,19 @@ def fetch_gdelt_data(
     logger.info(f"  Period: {start_date} to {end_date}")
     
     try:
-        gd = GdeltDoc()
-        f = Filters(
-            keyword=keyword,
-            start_date=start_date,
-            end_date=end_date,
+        timeline_results = _timeline_search(
+            "timelinevol", keyword, start_date, end_date, cache_ttl
         )
         
-        timeline_results = gd.timeline_search("timelinevol", f)
-        
         logger.info(f"✓ Retrieved {len(timeline_results)} daily data points")
         
         # Save raw data
         if save_raw:
             raw_dir = Path("data/raw/gdelt")
             raw_dir.mkdir(parents=True, exist_ok=True)
-            timeline_results.to_csv(
-                raw_dir / f"gdelt_volume_{keyword.lower()}.csv",
-                index=False
+            write_parquet(
+                timeline_results,
+                raw_dir / f"gdelt_volume_{keyword.lower()}.parquet"
             )
         
         return timeline_results
@@ -71,7 +101,8 @@ def fetch_gdelt_tone(
     keyword: str,
     start_date: str,
     end_date: str,
-    save_raw: bool = True
+    save_raw: bool = True,
+    cache_ttl: float = DEFAULT_TTL
 ) -> pd.DataFrame:
     """
     Fetch media tone/sentiment data from GDELT
@@ -86,6 +117,8 @@ def fetch_gdelt_tone(
         End date in YYYY-MM-DD format
     save_raw : bool
         Whether to save raw data to disk
+    cache_ttl : float
+        Seconds a cached response stays valid (0 bypasses the cache)
         
     Returns:
     --------
@@ -96,24 +129,19 @@ def fetch_gdelt_tone(
     logger.info(f"  Period: {start_date} to {end_date}")
     
     try:
-        gd = GdeltDoc()
-        f = Filters(
-            keyword=keyword,
-            start_date=start_date,
-            end_date=end_date,
+        tone_results = _timeline_search(
+            "timelinetone", keyword, start_date, end_date, cache_ttl
         )
         
-        tone_results = gd.timeline_search("timelinetone", f)
-        
         logger.info(f"✓ Retrieved {len(tone_results)} daily tone data points")
         
         # Save raw data
         if save_raw:
             raw_dir = Path("data/raw/gdelt")
             raw_dir.mkdir(parents=True, exist_ok=True)
-            tone_results.to_csv(
-                raw_dir / f"gdelt_tone_{keyword.lower()}.csv",
-                index=False
+            write_parquet(
+                tone_results,
+                raw_dir / f"gdelt_tone_{keyword.lower()}.parquet"
             )
         
         return tone_results
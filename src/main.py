@@ -7,6 +7,8 @@ Orchestrates data acquisition, processing, modeling, and visualization
 import sys
 from pathlib import Path
 import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -27,6 +29,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Quarter-end grid shared by every quarterly series in the analysis
+CANONICAL_QUARTERS = pd.date_range("2022-03-31", "2024-03-31", freq="QE")
+
 
 def main():
     """Run the complete analysis pipeline"""
@@ -62,39 +67,52 @@ def main():
         logger.info("Fetching DTM displacement data...")
         displacement_df = fetch_displacement_data(COUNTRY_LIST)
         
-        logger.info("Fetching GDELT media volume data...")
-        gdelt_timeline = fetch_gdelt_data(GDELT_KEYWORD, START_DATE, END_DATE)
-        
-        logger.info("Fetching GDELT tone data...")
-        tone_timeline = fetch_gdelt_tone(GDELT_KEYWORD, START_DATE, END_DATE)
+        # Volume and tone are independent, I/O-bound queries
+        logger.info("Fetching GDELT media volume and tone data...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            volume_future = executor.submit(
+                fetch_gdelt_data, GDELT_KEYWORD, START_DATE, END_DATE
+            )
+            tone_future = executor.submit(
+                fetch_gdelt_tone, GDELT_KEYWORD, START_DATE, END_DATE
+            )
+            gdelt_timeline = volume_future.result()
+            tone_timeline = tone_future.result()
         
         # Step 2: Data Processing
         logger.info("\n" + "="*70)
         logger.info("STEP 2: DATA PROCESSING")
         logger.info("="*70)
         
-        logger.info("Processing funding data with Prophet...")
+        logger.info("Processing funding data...")
         quarterly_funding = process_funding_data(funding_df)
         
         logger.info("Processing displacement data...")
-        aggregated_displacement = process_displacement_data(displacement_df)
+        aggregated_displacement = process_displacement_data(
+            displacement_df, quarters=CANONICAL_QUARTERS
+        )
         
         logger.info("Processing GDELT volume data...")
-        quarterly_gdelt = process_gdelt_data(gdelt_timeline)
+        quarterly_gdelt = process_gdelt_data(
+            gdelt_timeline, quarters=CANONICAL_QUARTERS
+        )
         
         logger.info("Processing GDELT tone data...")
-        quarterly_tone = process_tone_data(tone_timeline)
+        quarterly_tone = process_tone_data(
+            tone_timeline, quarters=CANONICAL_QUARTERS
+        )
         
         # Step 3: Correlation Analysis
         logger.info("\n" + "="*70)
         logger.info("STEP 3: CORRELATION ANALYSIS")
         logger.info("="*70)
         
-        correlations = run_correlation_analysis(
+        correlations, aligned = run_correlation_analysis(
             quarterly_funding,
             aggregated_displacement,
             quarterly_gdelt,
-            quarterly_tone
+            quarterly_tone,
+            quarters=CANONICAL_QUARTERS
         )
         
         # Step 4: Visualization
@@ -102,12 +120,7 @@ def main():
         logger.info("STEP 4: GENERATING VISUALIZATIONS")
         logger.info("="*70)
         
-        generate_all_visualizations(
-            quarterly_funding,
-            aggregated_displacement,
-            quarterly_gdelt,
-            quarterly_tone
-        )
+        generate_all_visualizations(quarterly_funding, aligned)
         
         # Summary
         logger.info("\n" + "="*70)
@@ -3,6 +3,6 @@ Modeling Module
 Statistical analysis and correlation calculations
 """
 
-from .correlation_analysis import run_correlation_analysis
+from .correlation_analysis import AlignedSeries, run_correlation_analysis
 
-__all__ = ['run_correlation_analysis']
+__all__ = ['AlignedSeries', 'run_correlation_analysis']
@@ -3,21 +3,99 @@ Correlation Analysis Module
 Calculates Pearson correlations between different time series
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv
 import logging
-from scipy.stats import pearsonr
+from dataclasses import dataclass
+from functools import reduce
 from pathlib import Path
+from scipy import stats
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class AlignedSeries:
+    """
+    The four normalized series on the quarters they have in common
+    
+    `values` is a single 4 x n float64 buffer with one row per series
+    (funding, displacement, media volume, media tone), shared by the
+    correlation step and the plots.
+    """
+    dates: np.ndarray
+    values: np.ndarray
+    
+    @property
+    def fund(self) -> np.ndarray:
+        return self.values[0]
+    
+    @property
+    def disp(self) -> np.ndarray:
+        return self.values[1]
+    
+    @property
+    def vol(self) -> np.ndarray:
+        return self.values[2]
+    
+    @property
+    def tone(self) -> np.ndarray:
+        return self.values[3]
+
+
+def _correlation_matrix(series: np.ndarray) -> tuple:
+    """
+    Pairwise Pearson correlations and two-sided p-values of stacked series
+    
+    Parameters:
+    -----------
+    series : np.ndarray
+        k x n array, one aligned series per row
+        
+    Returns:
+    --------
+    tuple
+        (r, p) k x k arrays of correlation coefficients and p-values
+    """
+    n = series.shape[1]
+    
+    centered = series - series.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Constant rows have zero norm and give NaN correlations
+        unit = centered / np.linalg.norm(centered, axis=1, keepdims=True)
+        r = np.clip(unit @ unit.T, -1.0, 1.0)
+        
+        # t = r * sqrt((n - 2) / (1 - r^2)) is infinite for |r| = 1 (p = 0)
+        t = r * np.sqrt((n - 2) / (1.0 - r ** 2))
+    p = 2 * stats.t.sf(np.abs(t), n - 2)
+    
+    return r, p
+
+
+def _values_at(dates: pd.Series, values: pd.Series, common: np.ndarray) -> np.ndarray:
+    """
+    Binary-search the rows of `common` dates (all present in `dates`) and
+    return their values, in `common` order
+    """
+    dates = dates.to_numpy(dtype='datetime64[ns]')
+    
+    # Processed series are already sorted, so this is a linear pass
+    order = np.argsort(dates, kind='stable')
+    rows = order[np.searchsorted(dates[order], common)]
+    
+    return values.to_numpy(dtype=np.float64)[rows]
+
+
 def run_correlation_analysis(
     funding_df: pd.DataFrame,
     displacement_df: pd.DataFrame,
     gdelt_volume_df: pd.DataFrame,
     gdelt_tone_df: pd.DataFrame,
-    save_results: bool = True
-) -> dict:
+    save_results: bool = True,
+    quarters: pd.DatetimeIndex = None
+) -> tuple:
     """
     Run correlation analysis between all time series
     
@@ -33,69 +111,77 @@ def run_correlation_analysis(
         Processed GDELT tone data
     save_results : bool
         Whether to save results to file
+    quarters : pd.DatetimeIndex, optional
+        Shared quarter-end grid. When given, every series is reindexed
+        onto it directly instead of intersecting their dates
         
     Returns:
     --------
-    dict
-        Dictionary containing correlation coefficients and p-values
+    tuple
+        (results, aligned): dictionary of correlation coefficients and
+        p-values, and the AlignedSeries they were computed from
     """
     logger.info("Running correlation analysis...")
     
     # Align funding data to quarterly
-    funding_quarterly = funding_df.set_index('ds').resample('QE').mean().reset_index()
+    quarter = funding_df['ds'].dt.to_period('Q')
+    funding_quarterly = funding_df[['yhat_norm']].groupby(quarter).mean(numeric_only=True)
+    funding_quarterly.index = (
+        funding_quarterly.index.to_timestamp(how='end').normalize().rename('ds')
+    )
+    funding_quarterly = funding_quarterly.reset_index()
     funding_quarterly = funding_quarterly[
         (funding_quarterly['ds'] >= '2022-02-01') & 
         (funding_quarterly['ds'] <= '2024-02-29')
     ]
     
-    # Find common dates across all datasets
-    common_dates = (
-        set(funding_quarterly['ds']) & 
-        set(displacement_df['reportingDate']) &
-        set(gdelt_volume_df['ds']) & 
-        set(gdelt_tone_df['ds'])
-    )
-    common_dates = sorted(list(common_dates))
-    
-    logger.info(f"  Common quarters for analysis: {len(common_dates)}")
-    
-    # Align all datasets
-    fund_aligned = funding_quarterly[
-        funding_quarterly['ds'].isin(common_dates)
-    ].sort_values('ds')
-    
-    disp_aligned = displacement_df[
-        displacement_df['reportingDate'].isin(common_dates)
-    ].sort_values('reportingDate')
-    
-    vol_aligned = gdelt_volume_df[
-        gdelt_volume_df['ds'].isin(common_dates)
-    ].sort_values('ds')
-    
-    tone_aligned = gdelt_tone_df[
-        gdelt_tone_df['ds'].isin(common_dates)
-    ].sort_values('ds')
-    
-    # Calculate correlations
-    corr_fund_disp, p_fund_disp = pearsonr(
-        fund_aligned['yhat_norm'].values,
-        disp_aligned['numPresentIdpInd_norm'].values
-    )
+    if quarters is not None:
+        # Reindex every series onto the shared grid and keep the quarters
+        # where all four have a value
+        reindexed = [
+            funding_quarterly.set_index('ds')['yhat_norm'].reindex(quarters),
+            displacement_df.set_index('reportingDate')['numPresentIdpInd_norm'].reindex(quarters),
+            gdelt_volume_df.set_index('ds')['volume_intensity_norm'].reindex(quarters),
+            gdelt_tone_df.set_index('ds')['tone_norm'].reindex(quarters),
+        ]
+        complete = np.logical_and.reduce([s.notna().to_numpy() for s in reindexed])
+        common_dates = quarters[complete]
+        
+        logger.info("  Common quarters for analysis: %d", len(common_dates))
+        
+        values = np.vstack([s.to_numpy(dtype=np.float64) for s in reindexed])[:, complete]
+    else:
+        # Find common dates across all datasets (sorted-merge intersection
+        # on the datetime64 buffers)
+        common_dates = reduce(np.intersect1d, [
+            funding_quarterly['ds'].to_numpy(dtype='datetime64[ns]'),
+            displacement_df['reportingDate'].to_numpy(dtype='datetime64[ns]'),
+            gdelt_volume_df['ds'].to_numpy(dtype='datetime64[ns]'),
+            gdelt_tone_df['ds'].to_numpy(dtype='datetime64[ns]'),
+        ])
+        
+        logger.info("  Common quarters for analysis: %d", len(common_dates))
+        
+        # Align all datasets and extract the values
+        values = np.vstack([
+            _values_at(funding_quarterly['ds'], funding_quarterly['yhat_norm'], common_dates),
+            _values_at(displacement_df['reportingDate'], displacement_df['numPresentIdpInd_norm'], common_dates),
+            _values_at(gdelt_volume_df['ds'], gdelt_volume_df['volume_intensity_norm'], common_dates),
+            _values_at(gdelt_tone_df['ds'], gdelt_tone_df['tone_norm'], common_dates),
+        ])
     
-    corr_fund_vol, p_fund_vol = pearsonr(
-        fund_aligned['yhat_norm'].values,
-        vol_aligned['volume_intensity_norm'].values
+    aligned = AlignedSeries(
+        dates=np.asarray(common_dates, dtype='datetime64[ns]'),
+        values=values
     )
     
-    corr_fund_tone, p_fund_tone = pearsonr(
-        fund_aligned['yhat_norm'].values,
-        tone_aligned['tone_norm'].values
-    )
+    # Calculate all pairwise correlations at once (rows: fund, disp, vol, tone)
+    r, p = _correlation_matrix(aligned.values)
     
-    corr_disp_vol, p_disp_vol = pearsonr(
-        disp_aligned['numPresentIdpInd_norm'].values,
-        vol_aligned['volume_intensity_norm'].values
-    )
+    corr_fund_disp, p_fund_disp = r[0, 1], p[0, 1]
+    corr_fund_vol, p_fund_vol = r[0, 2], p[0, 2]
+    corr_fund_tone, p_fund_tone = r[0, 3], p[0, 3]
+    corr_disp_vol, p_disp_vol = r[1, 2], p[1, 2]
     
     # Compile results
     results = {
@@ -109,61 +195,65 @@ def run_correlation_analysis(
         'disp_vol_p': p_disp_vol,
     }
     
-    # Log results
-    logger.info("\nCorrelation Results:")
-    logger.info("-" * 70)
-    
-    def interpret_correlation(r):
-        if abs(r) < 0.3:
-            return 'Weak'
-        elif abs(r) < 0.7:
-            return 'Moderate'
-        else:
-            return 'Strong'
-    
-    logger.info(f"\n1. Funding ↔ Displacement:        r = {corr_fund_disp:+.3f} (p = {p_fund_disp:.3f})")
-    logger.info(f"   Interpretation: {interpret_correlation(corr_fund_disp)} correlation")
-    
-    logger.info(f"\n2. Funding ↔ Media Volume:        r = {corr_fund_vol:+.3f} (p = {p_fund_vol:.3f})")
-    logger.info(f"   Interpretation: {interpret_correlation(corr_fund_vol)} correlation")
-    
-    logger.info(f"\n3. Funding ↔ Media Tone:          r = {corr_fund_tone:+.3f} (p = {p_fund_tone:.3f})")
-    logger.info(f"   Interpretation: {interpret_correlation(corr_fund_tone)} correlation")
+    # Report lines (shared by the log and the report file), only built
+    # when something will use them
+    log_results = logger.isEnabledFor(logging.INFO)
+    if log_results or save_results:
+        pairs = [
+            ("Funding ↔ Displacement:", corr_fund_disp, p_fund_disp),
+            ("Funding ↔ Media Volume:", corr_fund_vol, p_fund_vol),
+            ("Funding ↔ Media Tone:", corr_fund_tone, p_fund_tone),
+            ("Displacement ↔ Media Volume:", corr_disp_vol, p_disp_vol),
+        ]
+        
+        # |r| < 0.3 weak, < 0.7 moderate, otherwise strong
+        labels = np.array(['Weak', 'Moderate', 'Strong'])[
+            np.digitize(np.abs([corr for _, corr, _ in pairs]), [0.3, 0.7])
+        ]
+        
+        report = "\n\n".join(
+            f"{i}. {name:<31}r = {corr:+.3f} (p = {p_value:.3f})\n"
+            f"   Interpretation: {label} correlation"
+            for i, ((name, corr, p_value), label) in enumerate(zip(pairs, labels), 1)
+        )
     
-    logger.info(f"\n4. Displacement ↔ Media Volume:   r = {corr_disp_vol:+.3f} (p = {p_disp_vol:.3f})")
-    logger.info(f"   Interpretation: {interpret_correlation(corr_disp_vol)} correlation")
+    # Log results
+    if log_results:
+        logger.info("\nCorrelation Results:\n%s\n\n%s", "-" * 70, report)
     
     # Save results
     if save_results:
         results_dir = Path("data/outputs")
         results_dir.mkdir(parents=True, exist_ok=True)
         
-        results_df = pd.DataFrame([results])
-        results_df.to_csv(results_dir / "correlation_results.csv", index=False)
+        pa.csv.write_csv(
+            pa.Table.from_pylist([results]), results_dir / "correlation_results.csv"
+        )
         
         # Save detailed report
-        with open(results_dir / "correlation_report.txt", 'w') as f:
-            f.write("HUMANITARIAN FUNDING ANALYSIS - CORRELATION REPORT\n")
-            f.write("=" * 70 + "\n\n")
-            f.write(f"Analysis Period: 2022-02-01 to 2024-02-29\n")
-            f.write(f"Common Quarters: {len(common_dates)}\n\n")
-            f.write("CORRELATION RESULTS:\n")
-            f.write("-" * 70 + "\n\n")
-            f.write(f"1. Funding ↔ Displacement:        r = {corr_fund_disp:+.3f} (p = {p_fund_disp:.3f})\n")
-            f.write(f"   Interpretation: {interpret_correlation(corr_fund_disp)} correlation\n\n")
-            f.write(f"2. Funding ↔ Media Volume:        r = {corr_fund_vol:+.3f} (p = {p_fund_vol:.3f})\n")
-            f.write(f"   Interpretation: {interpret_correlation(corr_fund_vol)} correlation\n\n")
-            f.write(f"3. Funding ↔ Media Tone:          r = {corr_fund_tone:+.3f} (p = {p_fund_tone:.3f})\n")
-            f.write(f"   Interpretation: {interpret_correlation(corr_fund_tone)} correlation\n\n")
-            f.write(f"4. Displacement ↔ Media Volume:   r = {corr_disp_vol:+.3f} (p = {p_disp_vol:.3f})\n")
-            f.write(f"   Interpretation: {interpret_correlation(corr_disp_vol)} correlation\n\n")
-            f.write("=" * 70 + "\n\n")
-            f.write("KEY FINDINGS:\n")
-            f.write("• Funding shows more correlation with media patterns than displacement\n")
-            f.write("• This suggests funding is more responsive to visibility than need\n")
-            f.write("• High-profile crises attract disproportionate funding\n")
-    
-    return results
+        payload = "\n".join([
+            "HUMANITARIAN FUNDING ANALYSIS - CORRELATION REPORT",
+            "=" * 70,
+            "",
+            "Analysis Period: 2022-02-01 to 2024-02-29",
+            f"Common Quarters: {len(common_dates)}",
+            "",
+            "CORRELATION RESULTS:",
+            "-" * 70,
+            "",
+            report,
+            "",
+            "=" * 70,
+            "",
+            "KEY FINDINGS:",
+            "• Funding shows more correlation with media patterns than displacement",
+            "• This suggests funding is more responsive to visibility than need",
+            "• High-profile crises attract disproportionate funding",
+            "",
+        ])
+        (results_dir / "correlation_report.txt").write_text(payload, encoding="utf-8")
+    
+    return results, aligned
 
 
 if __name__ == "__main__":
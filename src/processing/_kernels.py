@@ -0,0 +1,93 @@
+"""
+Numerical Kernels
+Numba-compiled aggregations and design matrices used by the processing modules
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from numba import get_num_threads, njit, prange
+
+
+@njit(parallel=True, cache=True)
+def _sum_by_bucket(bucket_idx, values, n_buckets, n_chunks):
+    """
+    Sum `values` into `n_buckets` bins, skipping NaN
+
+    Each of the `n_chunks` parallel tasks reduces a contiguous slice into
+    its own row of partial sums and counts, so no two threads write the
+    same slot. Returns (sums, counts of non-NaN values per bin).
+    """
+    n = bucket_idx.shape[0]
+    chunk = (n + n_chunks - 1) // n_chunks
+
+    partial = np.zeros((n_chunks, n_buckets))
+    seen = np.zeros((n_chunks, n_buckets), dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(c * chunk, min(n, (c + 1) * chunk)):
+            v = values[i]
+            if v == v:
+                partial[c, bucket_idx[i]] += v
+                seen[c, bucket_idx[i]] += 1
+
+    return partial.sum(axis=0), seen.sum(axis=0)
+
+
+def quarterly_sum(dates: pd.Series, values: pd.Series) -> pd.Series:
+    """
+    Sum `values` per calendar quarter of `dates`
+
+    Returns a Series indexed by quarter-end date covering every quarter
+    between the first and last date. Quarters with no values are NaN
+    rather than 0, like `resample("QE").sum(min_count=1)`.
+    """
+    vals = values.to_numpy()
+    if vals.dtype.kind not in "iuf":
+        vals = values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    if len(vals) == 0:
+        return pd.Series(
+            [], index=pd.DatetimeIndex([], name=dates.name), name=values.name, dtype=vals.dtype
+        )
+
+    # Quarter ordinal since 1970 from months since epoch
+    quarters = dates.to_numpy().astype("datetime64[M]").astype(np.int64) // 3
+    first = quarters.min()
+    n_quarters = int(quarters.max() - first) + 1
+
+    n_chunks = max(1, min(get_num_threads(), len(vals)))
+    totals, counts = _sum_by_bucket(
+        (quarters - first).astype(np.intp), vals, n_quarters, n_chunks
+    )
+    empty = counts == 0
+    if empty.any():
+        totals[empty] = np.nan
+    elif vals.dtype.kind in "iu":
+        totals = totals.astype(np.int64)
+
+    first_end = pd.Timestamp(np.datetime64(int(first) * 3 + 3, "M")) - pd.Timedelta(days=1)
+    index = pd.date_range(first_end, periods=n_quarters, freq="QE", name=dates.name)
+
+    return pd.Series(totals, index=index, name=values.name)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fill_fourier_design(t, period, order, out):
+    """Write the trend + Fourier columns for each `t` straight into `out`"""
+    for i in prange(t.shape[0]):
+        out[i, 0] = 1.0
+        out[i, 1] = t[i]
+        for k in range(1, order + 1):
+            angle = 2.0 * math.pi * k * t[i] / period
+            out[i, 2 * k] = math.sin(angle)
+            out[i, 2 * k + 1] = math.cos(angle)
+
+
+def fourier_design(t: np.ndarray, period: float, order: int) -> np.ndarray:
+    """
+    Design matrix [1, t, sin(2πkt/period), cos(2πkt/period) for k = 1..order]
+    """
+    t = np.ascontiguousarray(t, dtype=np.float64)
+    out = np.empty((t.shape[0], 2 + 2 * order))
+    _fill_fourier_design(t, float(period), int(order), out)
+    return out
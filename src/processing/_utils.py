@@ -0,0 +1,106 @@
+"""
+Processing Utilities
+Helpers shared by the processing modules
+"""
+
+import hashlib
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+PROCESSED_DIR = Path("data/processed")
+
+# Part of every processed cache key; bump it whenever the processing logic
+# changes so files written by older code are recomputed
+PROCESSING_VERSION = 2
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def processed_key(df: pd.DataFrame, params: tuple) -> str:
+    """
+    Hash a raw input frame plus the processing parameters (and
+    PROCESSING_VERSION) into a cache key
+    """
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr((PROCESSING_VERSION, params)).encode())
+    return digest.hexdigest()
+
+
+def load_processed(name: str, key: str):
+    """
+    Load data/processed/<name>.parquet if its .sha256 sidecar matches `key`,
+    or None if it is missing, unreadable or was built from different inputs
+    """
+    path = PROCESSED_DIR / f"{name}.parquet"
+    sidecar = path.with_suffix(".sha256")
+    if not (path.exists() and sidecar.exists()) or sidecar.read_text().strip() != key:
+        return None
+
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+
+
+def store_processed(df: pd.DataFrame, name: str, key: str):
+    """Write data/processed/<name>.parquet and its .sha256 sidecar"""
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROCESSED_DIR / f"{name}.parquet"
+    df.to_parquet(path, engine="pyarrow", compression="snappy", index=False)
+    path.with_suffix(".sha256").write_text(key)
+
+
+def filter_date_window(
+    df: pd.DataFrame,
+    column: str,
+    start_date: str,
+    end_date: str
+) -> pd.DataFrame:
+    """
+    Keep rows whose `column` falls within [start_date, end_date]
+
+    ISO-8601 string dates are first pre-filtered lexically, so only rows
+    inside the window get parsed. Unparseable dates (NaT) fail the window
+    comparison, so the range check and the dropna are one mask, and the
+    frame is copied once. The returned frame has `column` parsed to
+    timezone-naive datetime: tz-aware values (gdeltdoc returns UTC) are
+    converted to naive UTC so they line up with the analysis quarters.
+    """
+    values = df[column]
+    keep = np.ones(len(df), dtype=bool)
+
+    first = values.first_valid_index()
+    if first is not None and isinstance(values[first], str) and _ISO_DATE.match(values[first]):
+        # Compare against the day after end_date: "2024-02-29T00:00:00"
+        # sorts after "2024-02-29"
+        end_exclusive = (pd.Timestamp(end_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        keep = ((values >= start_date) & (values < end_exclusive)).to_numpy(copy=True)
+        values = values[keep]
+
+    parsed = pd.to_datetime(values, format="ISO8601", errors="coerce", cache=True)
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_convert(None)
+    in_window = ((parsed >= start_date) & (parsed <= end_date)).to_numpy()
+    keep[keep] = in_window
+
+    return df.loc[keep].assign(**{column: parsed[in_window].array})
+
+
+def min_max_normalize(values: pd.Series) -> np.ndarray:
+    """
+    Scale values to [0, 1], ignoring NaN (a constant series maps to 0)
+    """
+    # No copy for float64 columns; the result goes into one new buffer
+    x = values.to_numpy(dtype=np.float64, copy=False)
+    out = np.empty_like(x)
+    if np.isnan(x).all():
+        out.fill(np.nan)
+        return out
+
+    x_min, x_max = np.nanmin(x), np.nanmax(x)
+    x_range = x_max - x_min
+    np.subtract(x, x_min, out=out)
+    np.divide(out, x_range if x_range != 0 else 1.0, out=out)
+    return out
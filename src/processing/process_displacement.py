@@ -4,9 +4,17 @@ Processes DTM data with quarterly aggregation
 """
 
 import pandas as pd
+import numpy as np
 import logging
-from pathlib import Path
-from sklearn.preprocessing import MinMaxScaler
+
+from ._kernels import quarterly_sum
+from ._utils import (
+    filter_date_window,
+    load_processed,
+    min_max_normalize,
+    processed_key,
+    store_processed,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +23,8 @@ def process_displacement_data(
     displacement_df: pd.DataFrame,
     start_date: str = "2022-02-01",
     end_date: str = "2024-02-29",
-    save_processed: bool = True
+    save_processed: bool = True,
+    quarters: pd.DatetimeIndex = None
 ) -> pd.DataFrame:
     """
     Process displacement data with quarterly aggregation
@@ -29,7 +38,11 @@ def process_displacement_data(
     end_date : str
         Analysis end date
     save_processed : bool
-        Whether to save processed data
+        Whether to save processed data (and reuse it while the raw
+        input and parameters are unchanged)
+    quarters : pd.DatetimeIndex, optional
+        Quarter-end dates to reindex the output onto (missing quarters
+        become NaN)
         
     Returns:
     --------
@@ -38,47 +51,52 @@ def process_displacement_data(
     """
     logger.info("Processing displacement data...")
     
-    # Parse dates
-    displacement_df["reportingDate"] = pd.to_datetime(
-        displacement_df["reportingDate"], 
-        errors="coerce"
-    )
-    displacement_df = displacement_df.dropna(subset=["reportingDate"])
+    if save_processed:
+        key = processed_key(
+            displacement_df[["reportingDate", "numPresentIdpInd"]],
+            (start_date, end_date, None if quarters is None else quarters.asi8.tolist())
+        )
+        cached = load_processed("displacement_processed", key)
+        if cached is not None:
+            logger.info("  ✓ Raw data unchanged, loaded data/processed/displacement_processed.parquet")
+            return cached
     
-    # Filter to analysis period
-    displacement_df = displacement_df[
-        (displacement_df["reportingDate"] >= start_date) &
-        (displacement_df["reportingDate"] <= end_date)
-    ]
+    # Filter to analysis period, parsing only the dates inside it
+    displacement_df = filter_date_window(
+        displacement_df, "reportingDate", start_date, end_date
+    )
     
     logger.info(f"  Records in period: {len(displacement_df)}")
     
-    # Quarterly aggregation
-    displacement_df["quarter"] = displacement_df["reportingDate"].dt.to_period("Q")
+    # int32 IDP counts halve the bytes streamed through the quarterly sum
+    counts = displacement_df["numPresentIdpInd"]
+    if (
+        pd.api.types.is_integer_dtype(counts)
+        and counts.abs().max() <= np.iinfo(np.int32).max
+    ):
+        displacement_df["numPresentIdpInd"] = counts.astype(np.int32)
     
-    aggregated = (
-        displacement_df.groupby("quarter")["numPresentIdpInd"]
-        .sum()
-        .reset_index()
+    # Quarterly aggregation (labelled by quarter-end date)
+    aggregated = quarterly_sum(
+        displacement_df["reportingDate"],
+        displacement_df["numPresentIdpInd"]
     )
     
-    # Convert quarter back to timestamp (end of quarter)
-    aggregated["reportingDate"] = aggregated["quarter"].dt.to_timestamp(how="end")
+    # Align onto the shared quarter grid
+    if quarters is not None:
+        aggregated = aggregated.reindex(quarters).rename_axis("reportingDate")
+    
+    aggregated = aggregated.reset_index()
     
     # Normalize
-    scaler = MinMaxScaler()
-    aggregated["numPresentIdpInd_norm"] = scaler.fit_transform(
-        aggregated["numPresentIdpInd"].values.reshape(-1, 1)
-    )
+    aggregated["numPresentIdpInd_norm"] = min_max_normalize(aggregated["numPresentIdpInd"])
     
     logger.info(f"  ✓ Processed {len(aggregated)} quarters")
     logger.info(f"  ✓ Total IDPs: {aggregated['numPresentIdpInd'].sum():,.0f}")
     
     # Save processed data
     if save_processed:
-        processed_dir = Path("data/processed")
-        processed_dir.mkdir(parents=True, exist_ok=True)
-        aggregated.to_csv(processed_dir / "displacement_processed.csv", index=False)
+        store_processed(aggregated, "displacement_processed", key)
     
     return aggregated
 
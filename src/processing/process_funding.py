@@ -1,17 +1,25 @@
 """
 Funding Data Processing Module
-Processes FTS data and applies Prophet forecasting with quarterly seasonality
+Processes FTS data and fits a linear trend with quarterly seasonality
 """
 
 import pandas as pd
 import numpy as np
 import logging
-from pathlib import Path
-from prophet import Prophet
-from sklearn.preprocessing import MinMaxScaler
+
+from ._kernels import fourier_design
+from ._utils import (
+    load_processed,
+    min_max_normalize,
+    processed_key,
+    store_processed,
+)
 
 logger = logging.getLogger(__name__)
 
+SEASONAL_PERIOD = 91.25  # days in a quarter
+FOURIER_ORDER = 5
+
 
 def process_funding_data(
     funding_df: pd.DataFrame,
@@ -20,7 +28,7 @@ def process_funding_data(
     save_processed: bool = True
 ) -> pd.DataFrame:
     """
-    Process funding data with Prophet modeling
+    Process funding data with a trend + quarterly seasonality fit
     
     Parameters:
     -----------
@@ -31,70 +39,77 @@ def process_funding_data(
     end_date : str
         Analysis end date
     save_processed : bool
-        Whether to save processed data
+        Whether to save processed data (and reuse it while the raw
+        input and parameters are unchanged)
         
     Returns:
     --------
     pd.DataFrame
-        Processed and normalized funding forecast
+        Processed and normalized fitted funding series
     """
     logger.info("Processing funding data...")
     
-    # Parse dates
-    funding_df["createdAt"] = pd.to_datetime(funding_df["createdAt"], errors="coerce")
+    if save_processed:
+        key = processed_key(
+            funding_df[["createdAt", "amountUSD"]],
+            (start_date, end_date, SEASONAL_PERIOD, FOURIER_ORDER)
+        )
+        cached = load_processed("funding_processed", key)
+        if cached is not None:
+            logger.info("  ✓ Raw data unchanged, loaded data/processed/funding_processed.parquet")
+            return cached
+    
+    # Parse dates into a local copy; the caller's frame (and so the cache
+    # key above) must stay untouched
+    funding_df = funding_df.assign(createdAt=pd.to_datetime(
+        funding_df["createdAt"], format="ISO8601", errors="coerce", cache=True
+    ))
     funding_df = funding_df.dropna(subset=["createdAt"])
     
-    # Daily aggregation
+    # float32 amounts halve the bytes streamed through the daily sum
+    funding_df = funding_df.assign(amountUSD=pd.to_numeric(
+        funding_df["amountUSD"], errors="coerce"
+    ).astype(np.float32))
+    
+    # Daily aggregation on fixed-width datetime64[D] buckets (.values is
+    # UTC and timezone-naive, so "ds" compares against plain analysis dates)
+    day = funding_df["createdAt"].values.astype("datetime64[D]")
     funding_by_date = (
-        funding_df.groupby(funding_df["createdAt"].dt.date)["amountUSD"]
+        pd.DataFrame({"ds": day, "y": funding_df["amountUSD"].to_numpy()})
+        .groupby("ds", sort=True, as_index=False)["y"]
         .sum()
-        .reset_index()
     )
-    funding_by_date.columns = ["ds", "y"]
-    funding_by_date["ds"] = pd.to_datetime(funding_by_date["ds"])
+    funding_by_date["ds"] = funding_by_date["ds"].astype("datetime64[ns]")
     
     # Log transform to stabilize variance
-    funding_by_date["y"] = np.log1p(funding_by_date["y"])
+    funding_by_date["y"] = np.log1p(funding_by_date["y"].to_numpy())
     
     logger.info(f"  Daily data points: {len(funding_by_date)}")
     logger.info(f"  Date range: {funding_by_date['ds'].min()} to {funding_by_date['ds'].max()}")
     
-    # Prophet model with quarterly seasonality
-    logger.info("  Training Prophet model...")
-    model = Prophet(
-        yearly_seasonality=False,
-        weekly_seasonality=False,
-        daily_seasonality=False
-    )
-    model.add_seasonality(name="quarterly", period=91.25, fourier_order=5)
-    
-    # Suppress Prophet output
-    import warnings
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        model.fit(funding_by_date)
+    # Least-squares fit of a linear trend plus quarterly Fourier terms
+    logger.info("  Fitting trend and quarterly seasonality...")
+    t = (funding_by_date["ds"] - funding_by_date["ds"].min()).dt.days.to_numpy(dtype=np.float64)
+    X = fourier_design(t, SEASONAL_PERIOD, FOURIER_ORDER)
+    beta, *_ = np.linalg.lstsq(X, funding_by_date["y"].to_numpy(dtype=np.float64), rcond=None)
     
-    # Generate forecast
-    forecast = model.predict(model.make_future_dataframe(periods=0))
-    forecast = forecast[["ds", "yhat"]]
+    forecast = funding_by_date[["ds"]].copy()
+    forecast["yhat"] = X @ beta
     
     # Filter to analysis period
     forecast = forecast[
         (forecast["ds"] >= start_date) & (forecast["ds"] <= end_date)
-    ]
+    ].reset_index(drop=True)
     
     # Normalize
-    scaler = MinMaxScaler()
-    forecast["yhat_norm"] = scaler.fit_transform(forecast["yhat"].values.reshape(-1, 1))
+    forecast["yhat_norm"] = min_max_normalize(forecast["yhat"])
     
     logger.info(f"  ✓ Processed {len(forecast)} days")
     logger.info(f"  ✓ Period: {forecast['ds'].min()} to {forecast['ds'].max()}")
     
     # Save processed data
     if save_processed:
-        processed_dir = Path("data/processed")
-        processed_dir.mkdir(parents=True, exist_ok=True)
-        forecast.to_csv(processed_dir / "funding_processed.csv", index=False)
+        store_processed(forecast, "funding_processed", key)
     
     return forecast
 
@@ -5,8 +5,14 @@ Processes GDELT media coverage data with quarterly aggregation
 
 import pandas as pd
 import logging
-from pathlib import Path
-from sklearn.preprocessing import MinMaxScaler
+
+from ._utils import (
+    filter_date_window,
+    load_processed,
+    min_max_normalize,
+    processed_key,
+    store_processed,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +21,8 @@ def process_gdelt_data(
     gdelt_df: pd.DataFrame,
     start_date: str = "2022-02-01",
     end_date: str = "2024-02-29",
-    save_processed: bool = True
+    save_processed: bool = True,
+    quarters: pd.DatetimeIndex = None
 ) -> pd.DataFrame:
     """
     Process GDELT volume timeline data
@@ -29,7 +36,11 @@ def process_gdelt_data(
     end_date : str
         Analysis end date
     save_processed : bool
-        Whether to save processed data
+        Whether to save processed data (and reuse it while the raw
+        input and parameters are unchanged)
+    quarters : pd.DatetimeIndex, optional
+        Quarter-end dates to reindex the output onto (missing quarters
+        become NaN)
         
     Returns:
     --------
@@ -38,34 +49,44 @@ def process_gdelt_data(
     """
     logger.info("Processing GDELT volume data...")
     
+    if save_processed:
+        key = processed_key(
+            gdelt_df,
+            (start_date, end_date, None if quarters is None else quarters.asi8.tolist())
+        )
+        cached = load_processed("gdelt_volume_processed", key)
+        if cached is not None:
+            logger.info("  ✓ Raw data unchanged, loaded data/processed/gdelt_volume_processed.parquet")
+            return cached
+    
     # Rename columns
     gdelt_df.columns = ["ds", "volume_intensity"]
-    gdelt_df["ds"] = pd.to_datetime(gdelt_df["ds"])
     
-    # Filter to analysis period
-    gdelt_df = gdelt_df[
-        (gdelt_df["ds"] >= start_date) & 
-        (gdelt_df["ds"] <= end_date)
-    ]
+    # Filter to analysis period, parsing only the dates inside it
+    gdelt_df = filter_date_window(gdelt_df, "ds", start_date, end_date)
     
     logger.info(f"  Daily data points: {len(gdelt_df)}")
     
-    # Quarterly aggregation
-    quarterly = gdelt_df.set_index("ds").resample("QE").mean().reset_index()
+    # Quarterly aggregation (hash groupby on quarter ordinals, labelled by
+    # quarter-end date)
+    quarter = gdelt_df["ds"].dt.to_period("Q")
+    quarterly = gdelt_df[["volume_intensity"]].groupby(quarter).mean(numeric_only=True)
+    quarterly.index = quarterly.index.to_timestamp(how="end").normalize().rename("ds")
+    
+    # Align onto the shared quarter grid
+    if quarters is not None:
+        quarterly = quarterly.reindex(quarters).rename_axis("ds")
+    
+    quarterly = quarterly.reset_index()
     
     # Normalize
-    scaler = MinMaxScaler()
-    quarterly["volume_intensity_norm"] = scaler.fit_transform(
-        quarterly["volume_intensity"].values.reshape(-1, 1)
-    )
+    quarterly["volume_intensity_norm"] = min_max_normalize(quarterly["volume_intensity"])
     
     logger.info(f"  ✓ Processed {len(quarterly)} quarters")
     
     # Save processed data
     if save_processed:
-        processed_dir = Path("data/processed")
-        processed_dir.mkdir(parents=True, exist_ok=True)
-        quarterly.to_csv(processed_dir / "gdelt_volume_processed.csv", index=False)
+        store_processed(quarterly, "gdelt_volume_processed", key)
     
     return quarterly
 
@@ -74,7 +95,8 @@ def process_tone_data(
     tone_df: pd.DataFrame,
     start_date: str = "2022-02-01",
     end_date: str = "2024-02-29",
-    save_processed: bool = True
+    save_processed: bool = True,
+    quarters: pd.DatetimeIndex = None
 ) -> pd.DataFrame:
     """
     Process GDELT tone timeline data
@@ -88,7 +110,11 @@ def process_tone_data(
     end_date : str
         Analysis end date
     save_processed : bool
-        Whether to save processed data
+        Whether to save processed data (and reuse it while the raw
+        input and parameters are unchanged)
+    quarters : pd.DatetimeIndex, optional
+        Quarter-end dates to reindex the output onto (missing quarters
+        become NaN)
         
     Returns:
     --------
@@ -97,34 +123,44 @@ def process_tone_data(
     """
     logger.info("Processing GDELT tone data...")
     
+    if save_processed:
+        key = processed_key(
+            tone_df,
+            (start_date, end_date, None if quarters is None else quarters.asi8.tolist())
+        )
+        cached = load_processed("gdelt_tone_processed", key)
+        if cached is not None:
+            logger.info("  ✓ Raw data unchanged, loaded data/processed/gdelt_tone_processed.parquet")
+            return cached
+    
     # Rename columns
     tone_df.columns = ["ds", "tone"]
-    tone_df["ds"] = pd.to_datetime(tone_df["ds"])
     
-    # Filter to analysis period
-    tone_df = tone_df[
-        (tone_df["ds"] >= start_date) & 
-        (tone_df["ds"] <= end_date)
-    ]
+    # Filter to analysis period, parsing only the dates inside it
+    tone_df = filter_date_window(tone_df, "ds", start_date, end_date)
     
     logger.info(f"  Daily data points: {len(tone_df)}")
     
-    # Quarterly aggregation
-    quarterly = tone_df.set_index("ds").resample("QE").mean().reset_index()
+    # Quarterly aggregation (hash groupby on quarter ordinals, labelled by
+    # quarter-end date)
+    quarter = tone_df["ds"].dt.to_period("Q")
+    quarterly = tone_df[["tone"]].groupby(quarter).mean(numeric_only=True)
+    quarterly.index = quarterly.index.to_timestamp(how="end").normalize().rename("ds")
+    
+    # Align onto the shared quarter grid
+    if quarters is not None:
+        quarterly = quarterly.reindex(quarters).rename_axis("ds")
+    
+    quarterly = quarterly.reset_index()
     
     # Normalize
-    scaler = MinMaxScaler()
-    quarterly["tone_norm"] = scaler.fit_transform(
-        quarterly["tone"].values.reshape(-1, 1)
-    )
+    quarterly["tone_norm"] = min_max_normalize(quarterly["tone"])
     
     logger.info(f"  ✓ Processed {len(quarterly)} quarters")
     
     # Save processed data
     if save_processed:
-        processed_dir = Path("data/processed")
-        processed_dir.mkdir(parents=True, exist_ok=True)
-        quarterly.to_csv(processed_dir / "gdelt_tone_processed.csv", index=False)
+        store_processed(quarterly, "gdelt_tone_processed", key)
     
     return quarterly
 
@@ -3,156 +3,205 @@ Visualization Module
 Generates plots and charts for the analysis
 """
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
-# Set plotting style
-plt.style.use('seaborn-v0_8-darkgrid')
+
+@lru_cache(maxsize=1)
+def _setup_mpl():
+    """
+    Import pyplot and set the plotting style on first use, so importing
+    this module doesn't pay for matplotlib
+    """
+    # Files only, so pick Agg, unless pyplot is already loaded (e.g. in
+    # Jupyter): switching then would close the caller's open figures
+    if 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    # The plot functions rely on these defaults
+    plt.style.use('seaborn-v0_8-darkgrid')
+    plt.rcParams.update({
+        'axes.titlesize': 16,
+        'axes.titleweight': 'bold',
+        'axes.labelsize': 12,
+        'legend.fontsize': 11,
+        'axes.grid': True,
+        'grid.alpha': 0.3,
+        'figure.autolayout': True,
+        'savefig.dpi': 200,
+        'savefig.bbox': 'tight',
+    })
+    
+    return plt
 
 
 def plot_funding_vs_displacement(
     funding_df: pd.DataFrame,
-    displacement_df: pd.DataFrame,
-    output_dir: Path
+    aligned,
+    ax=None
 ):
-    """Plot funding vs displacement trends"""
+    """Plot funding vs displacement trends (on `ax`, or a new figure)"""
     
-    fig, ax = plt.subplots(figsize=(14, 7))
+    if ax is None:
+        _, ax = _setup_mpl().subplots(figsize=(14, 7))
     
     ax.plot(funding_df["ds"], funding_df["yhat_norm"],
            label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
     
-    ax.scatter(displacement_df["reportingDate"], 
-              displacement_df["numPresentIdpInd_norm"],
+    ax.scatter(aligned.dates, aligned.disp,
               label="Displacement (Normalized)", s=100, color='#D62828', 
               alpha=0.7, zorder=5)
     
-    ax.set_title("Humanitarian Funding vs. Global Displacement", 
-                fontsize=16, fontweight='bold')
-    ax.set_xlabel("Date", fontsize=12)
-    ax.set_ylabel("Normalized Values (0-1)", fontsize=12)
-    ax.legend(fontsize=11)
-    ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig(output_dir / 'funding_vs_displacement.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.set_title("Humanitarian Funding vs. Global Displacement")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Normalized Values (0-1)")
+    ax.legend()
     
-    logger.info("  ✓ Saved: funding_vs_displacement.png")
+    return ax.figure
 
 
 def plot_funding_vs_media_volume(
     funding_df: pd.DataFrame,
-    gdelt_df: pd.DataFrame,
-    output_dir: Path
+    aligned,
+    ax=None
 ):
-    """Plot funding vs media coverage volume"""
+    """Plot funding vs media coverage volume (on `ax`, or a new figure)"""
     
-    fig, ax = plt.subplots(figsize=(14, 7))
+    if ax is None:
+        _, ax = _setup_mpl().subplots(figsize=(14, 7))
     
     ax.plot(funding_df["ds"], funding_df["yhat_norm"],
            label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
     
-    ax.plot(gdelt_df["ds"], gdelt_df["volume_intensity_norm"],
+    ax.plot(aligned.dates, aligned.vol,
            label="GDELT Media Volume (Normalized)", linewidth=2.5, color='#F77F00')
     
-    ax.set_title("Funding vs Media Coverage Volume", 
-                fontsize=16, fontweight='bold')
-    ax.set_xlabel("Date", fontsize=12)
-    ax.set_ylabel("Normalized Values (0-1)", fontsize=12)
-    ax.legend(fontsize=11)
-    ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig(output_dir / 'funding_vs_media_volume.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.set_title("Funding vs Media Coverage Volume")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Normalized Values (0-1)")
+    ax.legend()
     
-    logger.info("  ✓ Saved: funding_vs_media_volume.png")
+    return ax.figure
 
 
 def plot_displacement_vs_media(
-    displacement_df: pd.DataFrame,
-    gdelt_df: pd.DataFrame,
-    output_dir: Path
+    aligned,
+    ax=None
 ):
-    """Plot displacement vs media coverage"""
+    """Plot displacement vs media coverage (on `ax`, or a new figure)"""
     
-    fig, ax = plt.subplots(figsize=(14, 7))
+    if ax is None:
+        _, ax = _setup_mpl().subplots(figsize=(14, 7))
     
-    ax.scatter(displacement_df["reportingDate"],
-              displacement_df["numPresentIdpInd_norm"],
+    ax.scatter(aligned.dates, aligned.disp,
               label="Displacement (Normalized)", s=100, color='#D62828', 
               alpha=0.7, zorder=5)
     
-    ax.plot(gdelt_df["ds"], gdelt_df["volume_intensity_norm"],
+    ax.plot(aligned.dates, aligned.vol,
            label="GDELT Media Volume (Normalized)", linewidth=2.5, color='#F77F00')
     
-    ax.set_title("Displacement vs Media Coverage", 
-                fontsize=16, fontweight='bold')
-    ax.set_xlabel("Date", fontsize=12)
-    ax.set_ylabel("Normalized Values (0-1)", fontsize=12)
-    ax.legend(fontsize=11)
-    ax.grid(True, alpha=0.3)
+    ax.set_title("Displacement vs Media Coverage")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Normalized Values (0-1)")
+    ax.legend()
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'displacement_vs_media.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    logger.info("  ✓ Saved: displacement_vs_media.png")
+    return ax.figure
 
 
 def plot_funding_vs_media_tone(
     funding_df: pd.DataFrame,
-    tone_df: pd.DataFrame,
-    output_dir: Path
+    aligned,
+    ax=None
 ):
-    """Plot funding vs media sentiment/tone"""
+    """Plot funding vs media sentiment/tone (on `ax`, or a new figure)"""
     
-    fig, ax = plt.subplots(figsize=(14, 7))
+    if ax is None:
+        _, ax = _setup_mpl().subplots(figsize=(14, 7))
     
     ax.plot(funding_df["ds"], funding_df["yhat_norm"],
            label="Funding (Normalized)", linewidth=2.5, color='#2E86AB')
     
-    ax.plot(tone_df["ds"], tone_df["tone_norm"],
+    ax.plot(aligned.dates, aligned.tone,
            label="GDELT Media Tone (Normalized)", linewidth=2.5, color='#06A77D')
     
-    ax.set_title("Funding vs Media Sentiment", 
-                fontsize=16, fontweight='bold')
-    ax.set_xlabel("Date", fontsize=12)
-    ax.set_ylabel("Normalized Values (0-1)", fontsize=12)
-    ax.legend(fontsize=11)
-    ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig(output_dir / 'funding_vs_media_tone.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.set_title("Funding vs Media Sentiment")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Normalized Values (0-1)")
+    ax.legend()
     
-    logger.info("  ✓ Saved: funding_vs_media_tone.png")
+    return ax.figure
 
 
 def generate_all_visualizations(
     funding_df: pd.DataFrame,
-    displacement_df: pd.DataFrame,
-    gdelt_volume_df: pd.DataFrame,
-    gdelt_tone_df: pd.DataFrame
+    aligned,
+    save_individual: bool = False
 ):
-    """Generate all visualization plots"""
+    """
+    Generate the 2x2 summary figure, and optionally one PNG per panel
+    
+    Parameters:
+    -----------
+    funding_df : pd.DataFrame
+        Processed daily funding series
+    aligned : AlignedSeries
+        Quarterly series on their common quarters, as returned by
+        `run_correlation_analysis`
+    save_individual : bool
+        Whether to also save each panel as its own 200 DPI PNG
+    """
     
     logger.info("Generating visualizations...")
+    plt = _setup_mpl()
     
     # Create output directory
     output_dir = Path("data/outputs")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Generate plots
-    plot_funding_vs_displacement(funding_df, displacement_df, output_dir)
-    plot_funding_vs_media_volume(funding_df, gdelt_volume_df, output_dir)
-    plot_displacement_vs_media(displacement_df, gdelt_volume_df, output_dir)
-    plot_funding_vs_media_tone(funding_df, gdelt_tone_df, output_dir)
+    panels = {
+        'funding_vs_displacement.png':
+            (plot_funding_vs_displacement, funding_df, aligned),
+        'funding_vs_media_volume.png':
+            (plot_funding_vs_media_volume, funding_df, aligned),
+        'displacement_vs_media.png':
+            (plot_displacement_vs_media, aligned),
+        'funding_vs_media_tone.png':
+            (plot_funding_vs_media_tone, funding_df, aligned),
+    }
+    
+    # All four panels on one figure
+    summary, axes = plt.subplots(2, 2, figsize=(20, 12))
+    for (plot, *data), ax in zip(panels.values(), axes.flat):
+        plot(*data, ax=ax)
+    
+    # (figure, dpi) pairs; None uses the savefig.dpi default
+    figures = {'summary.png': (summary, 150)}
+    if save_individual:
+        for name, (plot, *data) in panels.items():
+            figures[name] = (plot(*data), None)
+    
+    # Encode the PNGs in worker threads (zlib releases the GIL)
+    with ThreadPoolExecutor(max_workers=len(figures)) as executor:
+        futures = {
+            name: executor.submit(
+                fig.savefig, output_dir / name, dpi=dpi
+            )
+            for name, (fig, dpi) in figures.items()
+        }
+        for name, future in futures.items():
+            future.result()
+            logger.info(f"  ✓ Saved: {name}")
+    
+    for fig, _ in figures.values():
+        plt.close(fig)
     
     logger.info(f"\n✓ All visualizations saved to: {output_dir}")
 